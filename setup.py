@@ -10,6 +10,7 @@ setup(
                       'pytest',
                       'rdflib',
                       'pandas>=1.0.3',
+                      'scipy',
                       'torch'],
     author='Caglar Demir',
     author_email='caglardemir8@gmail.com',
@@ -1,5 +1,6 @@
 from vectograph.transformers import GraphGenerator
 from vectograph.quantizer import QCUT
+import numpy as np
 import pandas as pd
 from sklearn import datasets
 
@@ -22,3 +23,20 @@ class TestDefault:
                 new_kg.append((s, p, o))
 
         assert kg == new_kg
+
+    def test_multi_resolution_QCUT(self):
+        rs = np.random.RandomState(1)
+        df = pd.DataFrame({'a': rs.rand(1583), 'b': np.where(rs.rand(1583) < 0.1, np.nan, rs.randn(1583))})
+        # Resolutions that are not powers of two require rounding of quantile levels as in pd.qcut.
+        num_quantiles = [4, 5, 7, 8, 16, 32]
+        resolutions = QCUT(num_quantile=num_quantiles, separate_resolutions=True).transform(df.copy())
+        for q in num_quantiles:
+            assert resolutions[q].equals(QCUT(num_quantile=q).transform(df.copy()))
+            # Integers from numpy, e.g. np.arange, are single resolutions.
+            assert resolutions[q].equals(QCUT(num_quantile=np.int64(q)).transform(df.copy()))
+
+        X_transformed = QCUT(num_quantile=num_quantiles).transform(df.copy())
+        assert X_transformed.columns.tolist() == ['Feature_Category_' + c + '_q' + str(q)
+                                                  for c in df.columns for q in num_quantiles]
+        assert X_transformed['Feature_Category_a_q4'].cat.categories.tolist() == ['a_q4_quantile_' + str(i)
+                                                                               for i in range(4)]
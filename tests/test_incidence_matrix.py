@@ -0,0 +1,72 @@
+from vectograph.transformers import IncidenceMatrixGenerator
+from vectograph.quantizer import QCUT
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+import numpy as np
+import pytest
+import pandas as pd
+
+
+class TestIncidenceMatrix:
+    def test_incidence_matrix(self, tmp_path):
+        rs = np.random.RandomState(1)
+        df = pd.DataFrame({'a': rs.rand(100), 'b': np.where(rs.rand(100) < 0.1, np.nan, rs.randn(100)),
+                           'c': rs.choice(['x', 'y'], 100)})
+        X_transformed = QCUT(min_unique_val_per_column=3, num_quantile=4).transform(df.copy())
+        X_transformed.index = 'Event_' + X_transformed.index.astype(str)
+
+        path = str(tmp_path / 'incidence.npz')
+        generator = IncidenceMatrixGenerator(path=path)
+        matrix = generator.fit_transform(X_transformed)
+        assert matrix.shape == (100, 10)
+        assert sorted(generator.vocabulary_[:2]) == ['c_x', 'c_y']
+        assert generator.vocabulary_[2:6] == ['a_quantile_' + str(i) for i in range(4)]
+        # One entity per column and event except missing values.
+        assert (np.asarray(matrix.sum(axis=1)).ravel() == 3 - df['b'].isna().to_numpy()).all()
+        dense = matrix.toarray()
+        for i, (event, row) in enumerate(X_transformed.iterrows()):
+            assert {generator.vocabulary_[j] for j in np.flatnonzero(dense[i])} == \
+                   {('c_' + v if c == 'c' else v) for c, v in row.items() if not pd.isna(v)}
+
+        loaded, vocabulary, index = IncidenceMatrixGenerator.load(path)
+        assert (loaded != matrix).nnz == 0
+        assert vocabulary == generator.vocabulary_
+        assert index == X_transformed.index.tolist()
+
+        chunked = IncidenceMatrixGenerator(chunk_size=7).fit(X_transformed)
+        assert (chunked.transform(X_transformed) != matrix).nnz == 0
+        chunks = [X_transformed.iloc[i:i + 30] for i in range(0, 100, 30)]
+        assert (IncidenceMatrixGenerator().fit(chunks).transform(chunks) != matrix).nnz == 0
+
+    def test_pipeline(self):
+        rs = np.random.RandomState(1)
+        df = pd.DataFrame(rs.rand(100, 3), columns=['a', 'b', 'c'])
+        y = (df['a'] > 0.5).to_numpy()
+        pipeline = Pipeline([('qcut', QCUT(num_quantile=4)), ('incidence', IncidenceMatrixGenerator()),
+                             ('model', LogisticRegression())])
+        # QCUT modifies its input inplace.
+        assert pipeline.fit(df.copy(), y).score(df.copy(), y) > 0.9
+
+    def test_chunks_and_vocabulary(self):
+        df = pd.DataFrame({'x': pd.Categorical(['yes', 'no', 'yes']), 'y': pd.Categorical(['no', 'yes', None]),
+                           'z': ['a', 'b', 'a']})
+        generator = IncidenceMatrixGenerator()
+        matrix = generator.fit_transform(df)
+        assert generator.vocabulary_ == ['x_no', 'x_yes', 'y_no', 'y_yes', 'z_a', 'z_b']
+        # Names of a column do not depend on other columns.
+        assert IncidenceMatrixGenerator().fit(df[['x']]).vocabulary_ == ['x_no', 'x_yes']
+        assert matrix.toarray().tolist() == [[0, 1, 1, 0, 1, 0], [1, 0, 0, 1, 0, 1], [0, 1, 0, 0, 1, 0]]
+
+        # Chunks of a generator, e.g. pd.read_csv(..., chunksize=...), are read only once.
+        chunked = IncidenceMatrixGenerator().fit_transform(df.iloc[i:i + 2] for i in range(0, 3, 2))
+        assert (chunked != matrix).nnz == 0
+
+        empty = IncidenceMatrixGenerator(chunk_size=2).fit(df).transform(df.iloc[:0])
+        assert empty.shape == (0, 6)
+        assert IncidenceMatrixGenerator().fit_transform(iter([])).shape == (0, 0)
+
+    def test_unique_vocabulary(self):
+        df = pd.DataFrame({'p': pd.Categorical(['a']), 'q': pd.Categorical(['a']), 'r': pd.Categorical(['p_a'])})
+        assert IncidenceMatrixGenerator().fit(df).vocabulary_ == ['p_a', 'q_a', 'r_p_a']
+        with pytest.raises(ValueError):
+            IncidenceMatrixGenerator().fit(pd.DataFrame({'p': ['x_a'], 'p_x': ['a']}))
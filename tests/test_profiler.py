@@ -0,0 +1,63 @@
+from vectograph.profiler import ColumnProfiler, HyperLogLog
+from vectograph.utils import num_unique_values_per_column
+import numpy as np
+import pandas as pd
+
+
+class TestProfiler:
+    def test_exact_profile(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, np.nan, 2.0], 'b': ['x', 'y', 'x', None]})
+        profile = ColumnProfiler().fit(df).profile_
+        assert profile['a'] == {'dtype': 'float64', 'count': 4, 'null_count': 1, 'num_unique': 2,
+                                'num_unique_exact': True, 'num_unique_lower_bound': False, 'reached_min_unique': None}
+        assert profile['b']['null_count'] == 1
+        assert profile['b']['num_unique'] == df['b'].nunique()
+
+    def test_early_stop(self):
+        df = pd.DataFrame({'a': np.arange(1000), 'b': np.arange(1000) % 3})
+        profile = ColumnProfiler(min_unique=5, block_size=10).fit(df).profile_
+        assert profile['a']['reached_min_unique'] and profile['a']['num_unique_lower_bound']
+        assert not profile['a']['num_unique_exact']
+        assert profile['a']['num_unique'] < 1000
+        assert profile['b'] == {'dtype': 'int64', 'count': 1000, 'null_count': 0, 'num_unique': 3,
+                                'num_unique_exact': True, 'num_unique_lower_bound': False,
+                                'reached_min_unique': False}
+
+    def test_chunks_and_merge(self):
+        df = pd.DataFrame({'a': np.arange(100) % 7, 'b': np.arange(100)})
+        chunks = [df.iloc[i:i + 30] for i in range(0, 100, 30)]
+        assert ColumnProfiler(n_jobs=2).fit(chunks).profile_ == ColumnProfiler().fit(df).profile_
+        merged = ColumnProfiler().fit(chunks[:2]).merge(ColumnProfiler().fit(chunks[2:]))
+        assert merged.profile_ == ColumnProfiler().fit(df).profile_
+
+    def test_hyperloglog(self):
+        values = np.random.RandomState(1).rand(200000)
+        first, second = HyperLogLog().update(values[:100000]), HyperLogLog().update(values[100000:])
+        assert abs(first.merge(second).count() - 200000) / 200000 < 0.05
+        assert HyperLogLog().update(np.arange(100)).count() == 100
+        profile = ColumnProfiler(approximate=True).fit(pd.DataFrame({'a': values})).profile_
+        assert not profile['a']['num_unique_exact'] and not profile['a']['num_unique_lower_bound']
+        assert abs(profile['a']['num_unique'] - 200000) / 200000 < 0.05
+
+    def test_mixed_dtype_chunks(self):
+        # pd.read_csv(..., chunksize=...) yields int64 chunks and float64 chunks having missing values.
+        chunks = [pd.DataFrame({'a': np.arange(1000)}), pd.DataFrame({'a': np.append(np.arange(1000), np.nan)}),
+                  pd.DataFrame({'a': [-0.0, 0.0]})]
+        exact = ColumnProfiler().fit(chunks).profile_['a']
+        approximate = ColumnProfiler(approximate=True).fit(chunks).profile_['a']
+        assert exact['num_unique'] == 1000
+        # Sketches of equal values are identical regardless of dtypes.
+        assert approximate['num_unique'] == HyperLogLog().update(np.arange(1000)).count()
+        assert exact['dtype'] == approximate['dtype'] == 'int64/float64'
+
+    def test_report(self, capsys):
+        df = pd.DataFrame({'a': np.arange(1000), 'b': np.arange(1000) % 3, 'c': [1.0, np.nan] * 500})
+        num_unique_values_per_column(df)
+        # Missing values are counted as in len(df[c].unique())
+        assert capsys.readouterr().out == ''.join('# of unique values in {0}:{1}\n'.format(c, len(df[c].unique()))
+                                                  for c in df.columns)
+        num_unique_values_per_column(df, profile=ColumnProfiler(min_unique=5, block_size=10).fit(df).profile_)
+        assert capsys.readouterr().out == '# of unique values in a:>=10\n# of unique values in b:3\n' \
+                                          '# of unique values in c:2\n'
+        num_unique_values_per_column(df, approximate=True)
+        assert capsys.readouterr().out.startswith('# of unique values in a:~')
@@ -0,0 +1,290 @@
+from sklearn.base import BaseEstimator, TransformerMixin
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch for approximate number of distinct values (Flajolet et al. 2007).
+
+    Values are hashed with pandas.util.hash_array into 64 bit integers. The first *precision* bits select a register,
+    the remaining bits determine the position of the leftmost one bit. Memory usage is 2**precision bytes and the
+    relative standard error is approximately 1.04 / sqrt(2**precision).
+    Sketches built over different chunks of the same column can be merged.
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f'precision must be in [4, 18], got {precision}')
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    @staticmethod
+    def __bit_length(x: np.ndarray) -> np.ndarray:
+        """
+        Vectorized int.bit_length() for uint64 values.
+        Each 32 bit half is represented exactly in float64, hence the exponent of frexp is the bit length.
+        :param x:
+        :return:
+        """
+        high = (x >> np.uint64(32)).astype(np.float64)
+        low = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+    def update(self, values):
+        """
+        Add values into the sketch. Missing values are expected to be removed beforehand.
+        :param values: array-like
+        :return:
+        """
+        values = np.asarray(values)
+        if len(values) == 0:
+            return self
+        # hash_array hashes raw bytes, hence 1 and 1.0 would be different values. A column may be int64 in a chunk
+        # and float64 in another chunk having missing values, e.g. pd.read_csv(..., chunksize=...).
+        if values.dtype.kind in 'biuf':
+            # Adding 0.0 maps -0.0 to 0.0.
+            values = values.astype(np.float64) + 0.0
+        hashed = pd.util.hash_array(values)
+        q = 64 - self.precision
+        index = (hashed >> np.uint64(q)).astype(np.intp)
+        rest = hashed & np.uint64((1 << q) - 1)
+        rank = (q - self.__bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """
+        Union of two sketches.
+        :param other: HyperLogLog with the same precision
+        :return:
+        """
+        if self.precision != other.precision:
+            raise ValueError('Sketches having different precisions can not be merged')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values.
+        :return:
+        """
+        m = self.num_registers
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        num_zeros = int(np.count_nonzero(self.registers == 0))
+        # Small range correction via linear counting.
+        if estimate <= 2.5 * m and num_zeros > 0:
+            estimate = m * np.log(m / num_zeros)
+        return int(round(estimate))
+
+
+class ColumnProfiler(BaseEstimator, TransformerMixin):
+    """
+    Single-pass column profiler. ColumnProfiler Class inherits from  BaseEstimator and  TransformerMixin so that it can
+    be used in sklearn Pipeline.
+
+    For each column, the profiler keeps track of
+        * the number of rows and the number of missing values,
+        * the dtype,
+        * the exact number of unique values (missing values excluded). If min_unique is given, exact counting stops
+        as soon as min_unique unique values are seen,
+        * an approximate number of unique values via HyperLogLog if approximate=True.
+
+    The input can be a Pandas Dataframe or an iterable of Dataframes, e.g. pd.read_csv(..., chunksize=...).
+    Columns are profiled in parallel with n_jobs threads. Profilers fitted on different chunks, e.g. by different
+    workers, can be combined via merge().
+
+    >>> profiler = ColumnProfiler(min_unique=6).fit(df)
+    >>> profiler.profile_['col1']
+    {'dtype': 'float64', 'count': 100, 'null_count': 0, 'num_unique': 6, 'num_unique_exact': False,
+    'num_unique_lower_bound': True, 'reached_min_unique': True}
+    """
+
+    def __init__(self, min_unique=None, approximate=False, precision=14, block_size=65536, n_jobs=1):
+        """
+
+        :param min_unique: Stop exact counting of unique values once this number is reached.
+        :param approximate: Estimate the number of unique values with HyperLogLog.
+        :param precision: Number of bits selecting a HyperLogLog register.
+        :param block_size: Number of rows processed at once when exact counting can stop early.
+        :param n_jobs: Number of threads.
+        """
+        self.min_unique = min_unique
+        self.approximate = approximate
+        self.precision = precision
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+        self.states = dict()
+
+    @property
+    def exact(self):
+        # Exact counting is bounded if min_unique is given, hence it is also kept in the approximate mode.
+        return not self.approximate or self.min_unique is not None
+
+    def __new_state(self):
+        return {'dtypes': [], 'count': 0, 'null_count': 0, 'unique': np.empty(0) if self.exact else None, 'pending': [],
+                'saturated': False, 'hll': HyperLogLog(self.precision) if self.approximate else None}
+
+    @staticmethod
+    def __union(arrays) -> np.ndarray:
+        """
+        Union of arrays of unique values. Hashing is performed by pd.unique, hence values are not boxed into Python
+        objects.
+        :param arrays: a list of arrays, each containing unique values.
+        :return:
+        """
+        arrays = [i for i in arrays if len(i)]
+        if len(arrays) == 0:
+            return np.empty(0)
+        if len(arrays) == 1:
+            return arrays[0]
+        return pd.unique(np.concatenate(arrays))
+
+    def __compact(self, state):
+        """
+        Without min_unique, unique values of chunks are combined lazily so that each chunk is hashed only once.
+        :param state:
+        :return:
+        """
+        if state['pending']:
+            state['unique'] = self.__union([state['unique']] + state['pending'])
+            state['pending'] = []
+        return state
+
+    def __update_column(self, state, series: pd.Series):
+        """
+        Update a column state with a chunk of the column.
+        :param state:
+        :param series:
+        :return:
+        """
+        dtype = str(series.dtype)
+        if dtype not in state['dtypes']:
+            state['dtypes'].append(dtype)
+        mask = series.isna()
+        num_nulls = int(mask.sum())
+        state['count'] += len(series)
+        state['null_count'] += num_nulls
+        values = series[~mask].to_numpy() if num_nulls else series.to_numpy()
+
+        if state['hll'] is not None:
+            state['hll'].update(values)
+
+        if state['unique'] is None or state['saturated']:
+            return state
+        if self.min_unique is None:
+            state['pending'].append(pd.unique(values))
+            return state
+        self.__compact(state)
+        for i in range(0, len(values), self.block_size):
+            state['unique'] = self.__union([state['unique'], pd.unique(values[i:i + self.block_size])])
+            if len(state['unique']) >= self.min_unique:
+                state['saturated'] = True
+                break
+        return state
+
+    def partial_fit(self, df: pd.DataFrame, y=None):
+        """
+        Update profiles with a chunk.
+        :param df:
+        :param y:
+        :return:
+        """
+        for col in df.columns:
+            if col not in self.states:
+                self.states[col] = self.__new_state()
+        if self.n_jobs == 1:
+            for col in df.columns:
+                self.__update_column(self.states[col], df[col])
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                list(executor.map(lambda c: self.__update_column(self.states[c], df[c]), df.columns))
+        return self
+
+    def fit(self, x, y=None):
+        """
+        :param x: a Pandas Dataframe or an iterable of Pandas Dataframes.
+        :param y:
+        :return:
+        """
+        self.states = dict()
+        if isinstance(x, pd.DataFrame):
+            x = [x]
+        for chunk in x:
+            self.partial_fit(chunk)
+        return self
+
+    def merge(self, other):
+        """
+        Combine the profiles of another profiler fitted on different rows of the same table.
+        :param other:
+        :return:
+        """
+        for col, other_state in other.states.items():
+            if col not in self.states:
+                self.states[col] = self.__new_state()
+            state = self.states[col]
+            state['dtypes'].extend(i for i in other_state['dtypes'] if i not in state['dtypes'])
+            state['count'] += other_state['count']
+            state['null_count'] += other_state['null_count']
+            if state['hll'] is not None and other_state['hll'] is not None:
+                state['hll'].merge(other_state['hll'])
+            if state['unique'] is not None and other_state['unique'] is not None:
+                state['unique'] = self.__union([state['unique'], other_state['unique']] + state['pending'] +
+                                               other_state['pending'])
+                state['pending'] = []
+                state['saturated'] = state['saturated'] or other_state['saturated'] or (
+                        self.min_unique is not None and len(state['unique']) >= self.min_unique)
+        return self
+
+    def __column_profile(self, state):
+        self.__compact(state)
+        # num_unique is either exact, estimated by HyperLogLog or a lower bound due to early stopping.
+        if state['unique'] is not None and not state['saturated']:
+            num_unique, num_unique_exact, num_unique_lower_bound = len(state['unique']), True, False
+        elif state['hll'] is not None:
+            num_unique, num_unique_exact, num_unique_lower_bound = state['hll'].count(), False, False
+            if state['unique'] is not None:
+                # Exact count is a lower bound.
+                num_unique = max(num_unique, len(state['unique']))
+        else:
+            num_unique, num_unique_exact, num_unique_lower_bound = len(state['unique']), False, True
+        return {'dtype': state['dtypes'][0] if len(state['dtypes']) == 1 else '/'.join(state['dtypes']),
+                'count': state['count'],
+                'null_count': state['null_count'],
+                'num_unique': num_unique,
+                'num_unique_exact': num_unique_exact,
+                'num_unique_lower_bound': num_unique_lower_bound,
+                'reached_min_unique': state['saturated'] if self.min_unique is not None else None}
+
+    @property
+    def profile_(self):
+        """
+        :return: a dictionary mapping column names to their profiles.
+        """
+        return {col: self.__column_profile(state) for col, state in self.states.items()}
+
+    def dtype_summary(self) -> Counter:
+        """
+        :return: number of columns per dtype.
+        """
+        return Counter(p['dtype'] for p in self.profile_.values())
+
+    def transform(self, df):
+        """
+        Profiling does not change the input.
+        :param df:
+        :return:
+        """
+        return df
@@ -1,5 +1,8 @@
 from sklearn.base import BaseEstimator, TransformerMixin
+import numbers
 from vectograph.utils import create_experiment_folder
+from vectograph.profiler import ColumnProfiler
+import numpy as np
 import pandas as pd
 
 
@@ -7,10 +10,17 @@ class QCUT(BaseEstimator, TransformerMixin):
     """
     Quantile-based discretization function based on Pandas(
     https://pandas.pydata.org/docs/reference/api/pandas.qcut.html)
+
+    If num_quantile is a list of integers, e.g. [4, 8, 16, 32], the bins of all resolutions are derived from a single
+    pass over each column (multi-resolution mode).
+    By default, all resolutions are stored in a single dataframe, i.e., the column col is discretized into
+    Feature_Category_col_q4, Feature_Category_col_q8, ... having col_q4_quantile_0, col_q8_quantile_0, ... values.
+    If separate_resolutions=True, a dictionary mapping each number of quantiles to a dataframe is returned, where
+    each dataframe is equivalent to the output of QCUT with the respective num_quantile.
     """
 
     def __init__(self, min_unique_val_per_column=1, num_quantile=4,
-                 remove_old_numerical_values=True, path=None, duplicates='raise'):
+                 remove_old_numerical_values=True, path=None, duplicates='raise', separate_resolutions=False):
         """
 
         :type storage_path: str
@@ -19,6 +29,7 @@ class QCUT(BaseEstimator, TransformerMixin):
         self.num_quantile = num_quantile
         self.remove_old_numerical_values = remove_old_numerical_values
         self.duplicates = duplicates
+        self.separate_resolutions = separate_resolutions
 
         if path is None:
             self.path, _ = create_experiment_folder()
@@ -96,24 +107,132 @@ class QCUT(BaseEstimator, TransformerMixin):
             self.path + '/Feature_Category_' + name_file + '_Mapping.csv')
         return 'Feature_Category_' + column_name, discretized, bin_values
 
+    @staticmethod
+    def __quantile_bins(x: pd.Series, num_quantiles, duplicates='raise'):
+        """
+        Given a vector of values, compute bin edges and bin indexes for each number of quantiles in one pass.
+        Values are assigned into right-closed bins where the first bin includes the lowest value as in pd.qcut.
+
+        1. Bin edges of all resolutions are computed by a single call of pd.Series.quantile as in pd.qcut, which
+        selects all required order statistics at once.
+        2. Each value is located among the union of bin edges of all resolutions via a single binary search.
+        3. The bin of each resolution is looked up from (2), since bin edges of a resolution are a subset of the union.
+
+        :param x: a pandas Series.
+        :param num_quantiles: a list of integers.
+        :param duplicates: raise or drop non-unique bin edges.
+        :return: a dictionary mapping each number of quantiles to codes (-1 for missing values) and bin edges.
+        """
+        mask = x.notna().to_numpy()
+        values = x.to_numpy()[mask]
+        if values.dtype.kind in 'mM':
+            values = values.view('i8')
+        if len(values) == 0:
+            raise ValueError(f'Column {x.name} does not contain any value')
+
+        levels = dict()
+        for q in num_quantiles:
+            quantiles = np.linspace(0, 1, q + 1)
+            # Round up rather than to nearest if not representable in base 2 as in pd.qcut.
+            np.putmask(quantiles, q * quantiles != np.arange(q + 1), np.nextafter(quantiles, 1))
+            levels[q] = quantiles
+        # 1. Select all required order statistics at once.
+        all_levels = np.unique(np.concatenate(list(levels.values())))
+        all_quantiles = pd.Series(values).quantile(all_levels).to_numpy(dtype=np.float64)
+        values = values.astype(np.float64)
+
+        edges = dict()
+        for q, quantiles in levels.items():
+            bin_values = all_quantiles[np.searchsorted(all_levels, quantiles)]
+            if len(np.unique(bin_values)) < len(bin_values):
+                if duplicates == 'raise':
+                    raise ValueError(f'Bin edges must be unique: {bin_values!r}.\n'
+                                     f'You can drop duplicate edges by setting the \'duplicates\' kwarg')
+                bin_values = np.unique(bin_values)
+            edges[q] = bin_values
+
+        # 2. Locate values among all bin edges, i.e., values in (all_edges[j-1], all_edges[j]] are mapped into j.
+        all_edges = np.unique(np.concatenate(list(edges.values())))
+        fine_codes = np.searchsorted(all_edges, values, side='left')
+
+        results = dict()
+        for q, bin_values in edges.items():
+            # 3. Map each j into the bin of this resolution containing all_edges[j]. The lowest value falls into 0.
+            lookup = np.maximum(np.searchsorted(bin_values, all_edges, side='left') - 1, 0)
+            codes = np.full(len(x), -1, dtype=np.intp)
+            codes[mask] = lookup[fine_codes]
+            results[q] = codes, bin_values
+        return results
+
+    def __perform_multi_resolution_discretization(self, column_name: str, df: pd.DataFrame):
+        """
+        Multi-resolution counterpart of __perform_discretization.
+
+        :param column_name:
+        :param df:
+        :return: a dictionary mapping each number of quantiles to a discretized pandas Series and bin values.
+        """
+        try:
+            bins = self.__quantile_bins(df[column_name], self.num_quantile, self.duplicates)
+        except ValueError as e:
+            print('#' * 10, end=' ')
+            print(f'Error at applying multi-resolution Quantile-based discretization function')
+            print(f'Number of quantiles per column/feature: {self.num_quantile} ')
+            print(f'Number of unique values of the column/feature {column_name}: {len(df[column_name].unique())}')
+            print(
+                f'Either reduce the number of quantile parameter or set the duplicates parameter to ***drop*** (currently {self.duplicates})')
+            raise e
+        name_file = column_name[column_name.rfind('/') + 1:]
+        results = dict()
+        for q, (codes, bin_values) in bins.items():
+            prefix = column_name if self.separate_resolutions else column_name + '_q' + str(q)
+            labels = [prefix + '_quantile_' + str(i) for i in range(len(bin_values) - 1)]
+            discretized = pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+                                    index=df.index, name=column_name)
+            pd.DataFrame.from_dict(dict(zip(labels, bin_values)), orient='index').to_csv(
+                self.path + '/Feature_Category_' + name_file + '_q' + str(q) + '_Mapping.csv')
+            results[q] = discretized, bin_values
+        return results
+
     def transform(self, df: pd.DataFrame):
         """
 
         :param df:
-        :return:
+        :return: a Pandas Dataframe, or a dictionary of Pandas Dataframes if separate_resolutions=True in the
+        multi-resolution mode.
         """
         df = self.__sanity_checking(df)
 
+        # np.int64 etc. from parameter grids are single resolutions as well.
+        multi_resolution = not isinstance(self.num_quantile, numbers.Integral)
+        if multi_resolution and self.separate_resolutions:
+            resolutions = {q: dict() for q in self.num_quantile}
         columns_to_drop = []
-        for col in df.select_dtypes(exclude='object').columns:
+        numerical_columns = df.select_dtypes(exclude='object').columns
+        # 0. Profile all columns in a single pass. Counting unique values stops as soon as the constraint is satisfied.
+        self.profile_ = ColumnProfiler(min_unique=self.min_unique_values_per_feature).fit(df[numerical_columns]).profile_
+        for col in numerical_columns:
             # 1. Check whether number of unique values in this respective column is greater than input constraint.
-            if len(df[col].unique()) >= self.min_unique_values_per_feature:
+            # Missing values are counted as a unique value as in pd.Series.unique().
+            profile = self.profile_[col]
+            if profile['num_unique'] + (profile['null_count'] > 0) >= self.min_unique_values_per_feature:
                 # 2. Remember the column.
                 columns_to_drop.append(col)
+                if multi_resolution:
+                    for q, (discretized, bin_values) in self.__perform_multi_resolution_discretization(
+                            column_name=col, df=df).items():
+                        if self.separate_resolutions:
+                            resolutions[q]['Feature_Category_' + col] = discretized
+                        else:
+                            df.loc[:, 'Feature_Category_' + col + '_q' + str(q)] = discretized
+                    continue
                 new_column_name, discretized, bin_values = self.__perform_discretization(column_name=col, df=df)
 
                 # 3. Create new column containing discretized values.
                 df.loc[:, new_column_name] = discretized
+        if multi_resolution and self.separate_resolutions:
+            base = df.drop(columns=columns_to_drop) if self.remove_old_numerical_values else df
+            return {q: base.assign(**columns) for q, columns in resolutions.items()}
         if self.remove_old_numerical_values:
             df.drop(columns=columns_to_drop, inplace=True)
         return df
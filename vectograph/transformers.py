@@ -1,5 +1,8 @@
 from sklearn.base import BaseEstimator, TransformerMixin
+from collections import Counter
 from rdflib import Graph, URIRef, Namespace  # basic RDF handling
+from scipy import sparse
+import numpy as np
 import pandas as pd
 from typing import  List
 
@@ -282,3 +285,211 @@ class GraphGenerator(BaseEstimator, TransformerMixin):
                         kg.append((subject, predicate, obj))
                         writer.write(self.__valid_triple_create(subject, predicate, obj))
             return kg
+
+
+class IncidenceMatrixGenerator(BaseEstimator, TransformerMixin):
+    """
+    IncidenceMatrixGenerator Class inherits from  BaseEstimator and  TransformerMixin so that it can be used in sklearn
+    Pipeline, e.g., after QCUT.
+
+    Given a Pandas Dataframe df, an instance of this class transforms df into a sparse event-by-entity incidence matrix
+    in the CSR format without generating RDF triples. Consequently. Given a df having the following form
+                                    index        Feature_Category_col1    Feature_Category_col2
+                                    Event_0     col1_quantile_0         col2_quantile_1
+                                    Event_1     col1_quantile_1         col2_quantile_1
+
+    We generate the following matrix
+                                    index    col1_quantile_0 col1_quantile_1 col2_quantile_0 col2_quantile_1
+                                    Event_0       1               0               0               1
+                                    Event_1       0               1               0               1
+
+    Columns of the matrix are given by the categories of each column of df (vocabulary_). Values of non-categorical
+    columns are considered as categories. Each category is named column_value, except categories generated by QCUT,
+    e.g. col1_quantile_0. Missing values and values that are not seen in fit do not have any nonzero entry.
+    """
+
+    def __init__(self, path=None, chunk_size=None, dtype=np.float64):
+        """
+
+        :param path: a path for serializing the matrix in the .npz format.
+        :param chunk_size: number of rows converted at once.
+        :param dtype:
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+
+    @staticmethod
+    def __chunks(x, chunk_size):
+        if isinstance(x, pd.DataFrame):
+            if chunk_size is None:
+                yield x
+            else:
+                for i in range(0, len(x), chunk_size):
+                    yield x.iloc[i:i + chunk_size]
+        else:
+            yield from x
+
+    @staticmethod
+    def __update_categories(chunk: pd.DataFrame, categories, categorical_columns):
+        """
+        Extend categories of each column with a chunk. New categories are appended so that codes of earlier chunks
+        remain valid.
+        :param chunk:
+        :param categories:
+        :param categorical_columns:
+        :return:
+        """
+        for col in chunk.columns:
+            if isinstance(chunk[col].dtype, pd.CategoricalDtype):
+                categorical_columns.add(col)
+                values = chunk[col].cat.categories
+            else:
+                values = chunk[col].dropna().unique()
+            if col in categories:
+                categories[col] = categories[col].append(pd.Index(values)).unique()
+            else:
+                categories[col] = pd.Index(values)
+
+    def __set_vocabulary(self, categories, categorical_columns):
+        """
+        Categories are prefixed with their column names, i.e. column_value, except categories generated by QCUT.
+        The latter already contain their column names, e.g. col1_quantile_0 in Feature_Category_col1.
+        :param categories:
+        :param categorical_columns:
+        :return:
+        """
+        self.categories_ = categories
+        self.offsets_ = dict(zip(categories, np.cumsum([0] + [len(i) for i in categories.values()])))
+        vocabulary = []
+        for col, values in categories.items():
+            col = str(col)
+            qcut_prefix = col[len('Feature_Category_'):] + '_' if col.startswith('Feature_Category_') else None
+            for v in map(str, values):
+                if col in categorical_columns and qcut_prefix and v.startswith(qcut_prefix) and '_quantile_' in v:
+                    vocabulary.append(v)
+                else:
+                    vocabulary.append(col + '_' + v)
+        duplicates = [name for name, count in Counter(vocabulary).items() if count > 1]
+        if duplicates:
+            raise ValueError(f'Feature names must be unique: {duplicates}. Please rename columns.')
+        self.vocabulary_ = vocabulary
+
+    def fit(self, x, y=None):
+        """
+        Learn the vocabulary.
+        :param x: a Pandas Dataframe or an iterable of Pandas Dataframes.
+        :param y:
+        :return:
+        """
+        categories, categorical_columns = dict(), set()
+        for chunk in self.__chunks(x, self.chunk_size):
+            self.__update_categories(chunk, categories, categorical_columns)
+        self.__set_vocabulary(categories, categorical_columns)
+        return self
+
+    def get_feature_names_out(self, input_features=None):
+        """
+        :param input_features:
+        :return: vocabulary_ as used by sklearn Pipeline.
+        """
+        return np.asarray(self.vocabulary_, dtype=object)
+
+    @staticmethod
+    def __entries(df: pd.DataFrame, categories):
+        """
+        Nonzero entries of a chunk, i.e., codes of values within the categories of their columns. Missing and unseen
+        values are omitted.
+        :param df:
+        :param categories:
+        :return: number of entries per row, column positions and codes of entries in row-major order.
+        """
+        codes = np.empty((len(df), len(categories)), dtype=np.int64)
+        for j, (col, c) in enumerate(categories.items()):
+            codes[:, j] = pd.Categorical(df[col], categories=c).codes
+        valid = codes >= 0
+        # Row-major order keeps column indexes sorted within each row.
+        rows, columns = np.nonzero(valid)
+        return valid.sum(axis=1), columns.astype(np.int32), codes[rows, columns].astype(np.int32)
+
+    def __offsets(self):
+        dtype = np.int32 if len(self.vocabulary_) < np.iinfo(np.int32).max else np.int64
+        return np.asarray([self.offsets_[col] for col in self.categories_], dtype=dtype)
+
+    def __to_csr(self, row_lengths, indices, index):
+        """
+        Build the CSR matrix from chunks.
+        :param row_lengths: a list of numbers of entries per row.
+        :param indices: a list of column indexes of entries.
+        :param index: a list of row indexes of chunks.
+        :return:
+        """
+        row_lengths = np.concatenate([np.zeros(0, dtype=np.int64)] + row_lengths)
+        indptr = np.zeros(len(row_lengths) + 1, dtype=np.int64)
+        np.cumsum(row_lengths, out=indptr[1:])
+        indices = np.concatenate([np.zeros(0, dtype=np.int64)] + indices)
+        matrix = sparse.csr_matrix((np.ones(len(indices), dtype=self.dtype), indices, indptr),
+                                   shape=(len(row_lengths), len(self.vocabulary_)))
+        if self.path is not None:
+            self.save(self.path, matrix, self.vocabulary_, np.concatenate([np.zeros(0, dtype=str)] + index))
+        return matrix
+
+    def transform(self, x):
+        """
+        :param x: a Pandas Dataframe or an iterable of Pandas Dataframes.
+        :return: a scipy.sparse.csr_matrix having a row per event and a column per entity in vocabulary_.
+        """
+        offsets = self.__offsets()
+        row_lengths, indices, index = [], [], []
+        for chunk in self.__chunks(x, self.chunk_size):
+            lengths, columns, codes = self.__entries(chunk, self.categories_)
+            row_lengths.append(lengths)
+            indices.append(offsets[columns] + codes)
+            index.append(chunk.index.astype(str))
+        return self.__to_csr(row_lengths, indices, index)
+
+    def fit_transform(self, x, y=None, **fit_params):
+        """
+        Learn the vocabulary and build the matrix by reading chunks only once, e.g. pd.read_csv(..., chunksize=...).
+        Offsets of columns are known after the last chunk, hence column positions and codes of entries are kept.
+        :param x: a Pandas Dataframe or an iterable of Pandas Dataframes.
+        :param y:
+        :return:
+        """
+        categories, categorical_columns = dict(), set()
+        row_lengths, entries, index = [], [], []
+        for chunk in self.__chunks(x, self.chunk_size):
+            self.__update_categories(chunk, categories, categorical_columns)
+            lengths, columns, codes = self.__entries(chunk, categories)
+            row_lengths.append(lengths)
+            entries.append((columns, codes))
+            index.append(chunk.index.astype(str))
+        self.__set_vocabulary(categories, categorical_columns)
+        offsets = self.__offsets()
+        return self.__to_csr(row_lengths, [offsets[columns] + codes for columns, codes in entries], index)
+
+    @staticmethod
+    def save(path, matrix, vocabulary, index):
+        """
+        Serialize the matrix, the vocabulary and the row index into a single .npz file.
+        :param path:
+        :param matrix:
+        :param vocabulary:
+        :param index:
+        :return:
+        """
+        matrix = matrix.tocsr()
+        np.savez_compressed(path, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                            shape=np.asarray(matrix.shape), vocabulary=np.asarray(vocabulary, dtype=str),
+                            index=np.asarray(index, dtype=str))
+
+    @staticmethod
+    def load(path):
+        """
+        :param path:
+        :return: a scipy.sparse.csr_matrix, vocabulary and the row index.
+        """
+        with np.load(path) as loaded:
+            matrix = sparse.csr_matrix((loaded['data'], loaded['indices'], loaded['indptr']),
+                                       shape=tuple(loaded['shape']))
+            return matrix, loaded['vocabulary'].tolist(), loaded['index'].tolist()
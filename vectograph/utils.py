@@ -1,6 +1,7 @@
 import datetime
 import logging
 import os
+from vectograph.profiler import ColumnProfiler
 
 
 def create_experiment_folder(folder_name='Vectograph_Storage'):
@@ -33,13 +34,26 @@ def create_logger(*, name, p):
 
     return logger
 
-def num_unique_values_per_column(df):
+def num_unique_values_per_column(df, profile=None, approximate=False):
     """
-    :param df: is a Pandas Dataframe.
+    :param df: is a Pandas Dataframe or an iterable of Pandas Dataframes.
+    :param profile: precomputed profile, e.g. ColumnProfiler().fit(df).profile_
+    :param approximate: estimate the number of unique values via HyperLogLog.
     :return:
     """
-    for c in df.columns:
-        print('# of unique values in {0}:{1}'.format(c, len(df[c].unique())))
+    if profile is None:
+        profile = ColumnProfiler(approximate=approximate).fit(df).profile_
+    for c, p in profile.items():
+        # Estimates are prefixed with ~ and lower bounds due to early stopping (e.g. QCUT().profile_) with >=.
+        # Missing values are counted as a unique value as in pd.Series.unique().
+        if p['num_unique_exact']:
+            prefix = ''
+        elif p['num_unique_lower_bound']:
+            prefix = '>='
+        else:
+            prefix = '~'
+        print('# of unique values in {0}:{1}{2}'.format(c, prefix, p['num_unique'] + (p['null_count'] > 0)))
+    return profile
 
 
 def ignore_columns(df,cols):